@@ -1,41 +1,94 @@
 import numpy as np
-from stl import mesh
-
-# NACA 0012 coordinates (symmetric airfoil, 2D)
-# You can get higher resolution or more accurate data from airfoiltools.com or generate programmatically
-x = np.linspace(0, 1, 100)
-yt = 0.12 / 0.2 * (0.2969*np.sqrt(x) - 0.1260*x - 0.3516*x**2 + 0.2843*x**3 - 0.1015*x**4)
-
-xu = x
-yu = yt
-xl = x
-yl = -yt
-
-# Stack upper and lower surfaces
-X = np.concatenate([xu, xl[::-1]])
-Y = np.concatenate([yu, yl[::-1]])
-Z = np.zeros_like(X)
-
-# Make it a thin extrusion (3D)
-thickness = 0.01
-Z1 = np.zeros_like(Z)
-Z2 = np.ones_like(Z) * thickness
-
-vertices = np.array([[x, y, z] for x, y, z in zip(X, Y, Z1)] + [[x, y, z] for x, y, z in zip(X, Y, Z2)])
-faces = []
-
-# Create triangular faces (simplified — refine for real use)
-for i in range(len(X) - 1):
-    faces.append([i, i+1, i+len(X)])
-    faces.append([i+1, i+len(X)+1, i+len(X)])
-
-faces = np.array(faces)
-
-# Create mesh
-airfoil = mesh.Mesh(np.zeros(faces.shape[0], dtype=mesh.Mesh.dtype))
-for i, f in enumerate(faces):
-    for j in range(3):
-        airfoil.vectors[i][j] = vertices[f[j], :]
-
-# Save STL
-airfoil.save('naca0012.stl')
+from stl import Mode, mesh
+
+
+def _extrusion_faces(n):
+    """Triangle indices for an extruded, closed NACA outline sampled at n chord stations.
+
+    The connectivity only depends on n, so it is shared by every airfoil in a batch.
+    """
+    # Outline is the upper surface LE->TE followed by the lower surface TE->LE,
+    # with the lower leading-edge point dropped since it coincides with the upper one
+    N = 2 * n - 1
+
+    # Side walls: one quad per outline segment, wound so normals point outward
+    i = np.arange(N)
+    j = (i + 1) % N  # wrap the last point back to the leading edge
+    side = np.empty((2 * N, 3), dtype=np.int32)
+    side[0::2] = np.column_stack([j, i, i + N])
+    side[1::2] = np.column_stack([j, i + N, j + N])
+
+    # End caps: pair each upper point with the lower point at the same chord
+    # station and split each strip quad in two, skipping the degenerate half
+    # at the leading edge where upper and lower coincide
+    upper = np.arange(n)
+    lower = (N - upper) % N
+    cap_bottom = np.concatenate([
+        np.column_stack([upper[:-1], upper[1:], lower[1:]]),
+        np.column_stack([upper[1:-1], lower[2:], lower[1:-1]]),
+    ]).astype(np.int32)
+    cap_top = cap_bottom[:, ::-1] + N
+
+    return np.vstack([side, cap_bottom, cap_top])
+
+
+def batch_naca(params, n=100, thickness=0.01):
+    """Generate extruded NACA 4-digit airfoils for every (m, p, t) row of params.
+
+    m, p and t are the maximum camber, its chord position and the maximum
+    thickness as fractions of the chord (NACA 2412 is (0.02, 0.4, 0.12)).
+    All airfoils are evaluated together by broadcasting over the batch axis, in
+    float32 since that is what STL stores.
+    """
+    params = np.atleast_2d(np.asarray(params, dtype=np.float32))
+    m, p, t = (params[:, k, None] for k in range(3))
+
+    # Cosine spacing clusters points at the leading and trailing edges where curvature is highest
+    x = 0.5 * (1 - np.cos(np.linspace(0, np.pi, n, dtype=np.float32)))
+    # Thickness polynomial in Horner form to avoid the x**2, x**3, x**4 temporaries
+    yt = 5 * t * (0.2969*np.sqrt(x) + x*(-0.1260 + x*(-0.3516 + x*(0.2843 - 0.1015*x))))
+
+    # Camber line, piecewise either side of p; symmetric sections have m = p = 0
+    fore = x < p
+    p_fore = np.where(p > 0, p, 1.0)
+    p_aft = np.where(p < 1, p, 0.0)
+    scale = np.where(fore, m / p_fore**2, m / (1 - p_aft)**2)
+    yc = scale * np.where(fore, 2*p*x - x**2, (1 - 2*p) + 2*p*x - x**2)
+    theta = np.arctan(scale * 2 * (p - x))
+
+    dx = yt * np.sin(theta)
+    dy = yt * np.cos(theta)
+    xu, yu = x - dx, yc + dy
+    xl, yl = x + dx, yc - dy
+
+    # Stack upper and lower surfaces into a closed loop (see _extrusion_faces)
+    X = np.concatenate([xu, xl[:, :0:-1]], axis=1)
+    Y = np.concatenate([yu, yl[:, :0:-1]], axis=1)
+    N = X.shape[1]
+
+    # Make it a thin extrusion (3D)
+    vertices = np.empty((len(params), 2 * N, 3), dtype=np.float32)
+    vertices[:, :N, 0] = vertices[:, N:, 0] = X
+    vertices[:, :N, 1] = vertices[:, N:, 1] = Y
+    vertices[:, :N, 2] = 0
+    vertices[:, N:, 2] = thickness
+
+    faces = _extrusion_faces(n)
+    triangles = vertices[:, faces]
+
+    airfoils = []
+    for vectors in triangles:
+        data = np.zeros(len(faces), dtype=mesh.Mesh.dtype)
+        data['vectors'] = vectors
+        airfoils.append(mesh.Mesh(data, remove_empty_areas=False))
+    return airfoils
+
+
+def naca(m, p, t, n=100, thickness=0.01):
+    """Generate a single extruded NACA 4-digit airfoil (see batch_naca)."""
+    return batch_naca([[m, p, t]], n, thickness)[0]
+
+
+if __name__ == "__main__":
+    # NACA 0012 (symmetric airfoil)
+    naca(0.0, 0.0, 0.12).save('naca0012.stl', mode=Mode.BINARY)
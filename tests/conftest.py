@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+
+from whittle.mesh.ai_assistant import OpenAIConversationManager
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions, recording every request"""
+    def __init__(self):
+        self.calls: List[dict] = []
+        self.reply = "Here is the controlDict."
+        self.summary = "Summary of what was agreed."
+        self.summary_error: Optional[Exception] = None
+
+    @property
+    def summary_calls(self) -> List[dict]:
+        return [call for call in self.calls if not call.get("stream")]
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            # reply may also be a function of the request's messages
+            reply = self.reply(kwargs["messages"]) if callable(self.reply) else self.reply
+            # The opening role-only delta has no text
+            pieces = [None] + [reply[i:i + 50] for i in range(0, len(reply), 50)]
+            events = [
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+                for piece in pieces
+            ]
+            # The final usage-only event has no choices
+            return iter(events + [SimpleNamespace(choices=[])])
+        if self.summary_error is not None:
+            raise self.summary_error
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.summary))]
+        )
+
+
+@pytest.fixture
+def completions():
+    return FakeCompletions()
+
+
+@pytest.fixture
+def make_manager(completions):
+    def make(**kwargs) -> OpenAIConversationManager:
+        manager = OpenAIConversationManager("sk-test", "You are a test assistant.", **kwargs)
+        manager.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        return manager
+    return make
@@ -0,0 +1,184 @@
+import io
+
+import openai
+import pytest
+from rich.console import Console
+
+from whittle.mesh.ai_assistant import LLMResponseCache
+
+
+def test_short_conversation_is_not_compacted(make_manager, completions):
+    manager = make_manager()
+    for question in ("first", "second", "third"):
+        assert manager.get_response(question) == completions.reply
+
+    assert completions.summary_calls == []
+    assert len(manager.messages) == 7
+
+
+def test_streamed_chunks_are_passed_to_on_chunk(make_manager, completions):
+    completions.reply = "x" * 120
+    chunks = []
+    reply = make_manager().get_response("hello", chunks.append)
+
+    assert "".join(chunks) == reply == completions.reply
+    assert len(chunks) == 3
+
+
+def test_compaction_keeps_system_prompt_and_turns_within_half_the_budget(
+    make_manager, completions
+):
+    completions.reply = "x" * 1200  # 300 tokens
+    manager = make_manager(max_history_tokens=1000)
+    system_message = dict(manager.messages[0])
+    for question in ("q1", "q2", "q3"):
+        manager.get_response(question)
+    assert completions.summary_calls == []
+
+    manager.get_response("q4")
+
+    assert len(completions.summary_calls) == 1
+    assert manager.messages[0] == system_message
+    assert manager.messages[1]["role"] == "system"
+    assert manager.messages[1]["content"].endswith(completions.summary)
+    # Only the latest exchange fits in half the budget; it is kept intact
+    assert manager.messages[2:] == [
+        {"role": "user", "content": "q4"},
+        {"role": "assistant", "content": completions.reply},
+    ]
+    transcript = completions.summary_calls[0]["messages"][-1]["content"]
+    assert "q1" in transcript and "q3" in transcript and "q4" not in transcript
+
+
+def test_compaction_splits_on_a_user_message(make_manager, completions):
+    completions.reply = "x" * 400  # 100 tokens
+    manager = make_manager(max_history_tokens=500)
+    for turn in range(8):
+        manager.get_response(f"q{turn}")
+
+    assert completions.summary_calls
+    assert manager.messages[2]["role"] == "user"
+    roles = [message["role"] for message in manager.messages[2:]]
+    assert roles == ["user", "assistant"] * (len(roles) // 2)
+
+
+def test_summaries_are_rare_with_dictionary_sized_replies(make_manager, completions):
+    completions.reply = "x" * 12000  # ~3k tokens, a typical set of dictionaries
+    completions.summary = "s" * 2000
+    manager = make_manager()
+    summary_turns = []
+    for turn in range(1, 21):
+        before = len(completions.summary_calls)
+        manager.get_response(f"question {turn}")
+        if len(completions.summary_calls) > before:
+            summary_turns.append(turn)
+
+    assert len(summary_turns) <= 3
+    assert manager._estimate_tokens(manager.messages) <= manager.max_history_tokens
+
+
+def test_failed_summary_keeps_history_and_returns_reply(make_manager, completions):
+    completions.reply = "x" * 1200
+    completions.summary_error = openai.OpenAIError("rate limited")
+    output = io.StringIO()
+    manager = make_manager(max_history_tokens=1000, console=Console(file=output))
+    for question in ("q1", "q2", "q3", "q4"):
+        assert manager.get_response(question) == completions.reply
+
+    assert len(completions.summary_calls) == 1
+    assert len(manager.messages) == 9
+    assert "rate limited" in output.getvalue()
+
+
+def test_unexpected_summary_error_propagates(make_manager, completions):
+    completions.reply = "x" * 1200
+    completions.summary_error = TypeError("bad response shape")
+    manager = make_manager(max_history_tokens=1000)
+    for question in ("q1", "q2", "q3"):
+        manager.get_response(question)
+
+    with pytest.raises(TypeError):
+        manager.get_response("q4")
+
+
+def test_cached_reply_skips_the_request(make_manager, completions, tmp_path):
+    cache = LLMResponseCache(cache_dir=tmp_path)
+    first = make_manager(cache=cache)
+    first.get_response("hello", temperature=0)
+    second = make_manager(cache=cache)
+    chunks = []
+
+    assert second.get_response("hello", chunks.append, temperature=0) == completions.reply
+    assert chunks == [completions.reply]
+    assert len(completions.calls) == 1
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_default_temperature_is_not_cached(make_manager, completions, tmp_path, monkeypatch):
+    monkeypatch.delenv("WHITTLE_CACHE_FORCE", raising=False)
+    cache = LLMResponseCache(cache_dir=tmp_path)
+    make_manager(cache=cache).get_response("hello")
+    make_manager(cache=cache).get_response("hello")
+
+    assert len(completions.calls) == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_hit_still_compacts(make_manager, completions, tmp_path):
+    completions.reply = "x" * 1200
+    cache = LLMResponseCache(cache_dir=tmp_path)
+    questions = ("q1", "q2", "q3", "q4")
+    first = make_manager(cache=cache, max_history_tokens=1000)
+    for question in questions:
+        first.get_response(question, temperature=0)
+    summaries = len(completions.summary_calls)
+
+    # Replaying the same conversation is served from the cache but still compacts
+    second = make_manager(cache=cache, max_history_tokens=1000)
+    for question in questions:
+        second.get_response(question, temperature=0)
+
+    assert len(completions.summary_calls) == summaries + 1
+    assert second.messages[1]["content"].startswith("Summary of the earlier conversation")
+
+
+def test_unwritable_cache_does_not_lose_the_reply(make_manager, completions, tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    manager = make_manager(cache=LLMResponseCache(cache_dir=blocker / "cache"))
+
+    assert manager.get_response("hello", temperature=0) == completions.reply
+    assert manager.messages[-1] == {"role": "assistant", "content": completions.reply}
+
+
+def test_batch_answers_each_prompt_against_the_current_history(make_manager, completions):
+    manager = make_manager()
+    manager.get_response("set up a cavity case")
+    history = [dict(message) for message in manager.messages]
+    completions.calls.clear()
+    completions.reply = lambda messages: "answer to " + messages[-1]["content"]
+
+    replies = manager.batch_get_responses([f"variant {i}" for i in range(12)])
+
+    assert replies == [f"answer to variant {i}" for i in range(12)]
+    assert manager.messages == history
+    for call in completions.calls:
+        assert call["messages"][:-1] == history
+        assert call["temperature"] == manager.temperature
+
+
+def test_batch_uses_the_cache_at_the_given_temperature(make_manager, completions, tmp_path):
+    cache = LLMResponseCache(cache_dir=tmp_path)
+    completions.reply = lambda messages: messages[-1]["content"].upper()
+    prompts = ["a", "b", "c"]
+
+    assert make_manager(cache=cache).batch_get_responses(prompts, temperature=0) == ["A", "B", "C"]
+    assert make_manager(cache=cache).batch_get_responses(prompts, temperature=0) == ["A", "B", "C"]
+    assert len(completions.calls) == 3
+    assert all(call["temperature"] == 0 for call in completions.calls)
+    assert cache.stats == {"hits": 3, "misses": 3}
+
+
+def test_empty_batch_sends_nothing(make_manager, completions):
+    assert make_manager().batch_get_responses([]) == []
+    assert completions.calls == []
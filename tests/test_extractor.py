@@ -0,0 +1,58 @@
+import random
+import re
+
+from whittle.mesh.ai_assistant import FoamDictionaryExtractor
+
+
+def _regex_extract(content):
+    """The DOTALL-regex extractor the str.find scan replaced"""
+    dictionaries = {}
+    for match in re.finditer(r"```foam\n(.*?)```", content, re.DOTALL):
+        body = match.group(1)
+        dict_match = re.search(r"object\s+(\w+);", body)
+        if dict_match:
+            dictionaries[dict_match.group(1)] = body
+    return dictionaries
+
+
+def test_extracts_foam_blocks_by_object_name():
+    content = (
+        "Here are the files.\n"
+        "```foam\nFoamFile\n{\n    object controlDict;\n}\nendTime 1;\n```\n"
+        "And the initial velocity:\n"
+        "```foam\nFoamFile { object U; }\ninternalField uniform (0 0 0);\n```\n"
+    )
+
+    dictionaries = FoamDictionaryExtractor().extract_dictionaries(content)
+
+    assert list(dictionaries) == ["controlDict", "U"]
+    assert dictionaries["controlDict"] == "FoamFile\n{\n    object controlDict;\n}\nendTime 1;\n"
+
+
+def test_ignores_other_blocks_unnamed_blocks_and_unterminated_blocks():
+    content = (
+        "```bash\nblockMesh\n```\n"
+        "```foam\n// no object directive\n```\n"
+        "```foam\nFoamFile { object p; }\n"
+    )
+
+    assert FoamDictionaryExtractor().extract_dictionaries(content) == {}
+
+
+def test_later_block_with_the_same_name_wins():
+    content = "```foam\nobject U; v1\n```\n```foam\nobject U; v2\n```"
+
+    assert FoamDictionaryExtractor().extract_dictionaries(content) == {"U": "object U; v2\n"}
+
+
+def test_matches_the_regex_extractor_on_random_replies():
+    pieces = [
+        "```foam\n", "```", "```foam", "```cpp\n", "\n", " ", "text ", "object ",
+        "object U;", "object  controlDict;", "object p ;", "object\t\nfvSchemes;",
+        "FoamFile {", "}", ";", "`", "``", "foam\n", "object alpha.water;",
+    ]
+    rng = random.Random(1234)
+    extractor = FoamDictionaryExtractor()
+    for _ in range(5000):
+        content = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+        assert extractor.extract_dictionaries(content) == _regex_extract(content), content
@@ -0,0 +1,108 @@
+import io
+import json
+
+from rich.console import Console
+
+from whittle.mesh.ai_assistant import AIAssistant
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_each_turn_is_appended_and_resumed(make_manager, completions, tmp_path):
+    path = tmp_path / ".whittle" / "chat.jsonl"
+    first = make_manager(persist_path=path)
+    assert not first.has_history
+    first.get_response("q1")
+    first.get_response("q2")
+
+    assert _lines(path) == first.messages[1:]
+    resumed = make_manager(persist_path=path)
+    assert resumed.has_history
+    assert resumed.messages == first.messages
+
+
+def test_saved_system_prompt_is_not_reused(make_manager, tmp_path):
+    path = tmp_path / "chat.jsonl"
+    make_manager(persist_path=path).get_response("q1")
+
+    assert all(message["role"] != "system" for message in _lines(path))
+    assert make_manager(persist_path=path).messages[0]["content"] == "You are a test assistant."
+
+
+def test_truncated_last_line_is_skipped_and_repaired(make_manager, completions, tmp_path):
+    path = tmp_path / "chat.jsonl"
+    make_manager(persist_path=path).get_response("q1")
+    with path.open("a") as f:
+        f.write('{"role": "user", "cont')
+    output = io.StringIO()
+
+    manager = make_manager(persist_path=path, console=Console(file=output))
+
+    assert len(manager.messages) == 3
+    assert "Skipped 1 unreadable line" in output.getvalue()
+    manager.get_response("q2")
+    assert [message["content"] for message in _lines(path)] == [
+        "q1", completions.reply, "q2", completions.reply,
+    ]
+
+
+def test_lines_that_are_not_messages_are_skipped(make_manager, tmp_path):
+    path = tmp_path / "chat.jsonl"
+    path.write_bytes(
+        b'{"role": "user", "content": "q1"}\n'
+        b'[1, 2]\n'
+        b'{"role": "assistant"}\n'
+        b'\xff\xfe\n'
+        b'\n'
+        b'{"role": "assistant", "content": "a1"}\n'
+    )
+
+    manager = make_manager(persist_path=path)
+
+    assert [message["content"] for message in manager.messages[1:]] == ["q1", "a1"]
+    assert len(path.read_text().splitlines()) == 2
+
+
+def test_compaction_rewrites_the_saved_conversation(make_manager, completions, tmp_path):
+    completions.reply = "x" * 1200
+    path = tmp_path / "chat.jsonl"
+    manager = make_manager(persist_path=path, max_history_tokens=1000)
+    for question in ("q1", "q2", "q3", "q4"):
+        manager.get_response(question)
+
+    assert completions.summary_calls
+    assert _lines(path) == manager.messages[1:]
+
+
+def test_unwritable_history_does_not_end_the_session(make_manager, completions, tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    manager = make_manager(persist_path=blocker / "chat.jsonl")
+
+    assert manager.get_response("q1") == completions.reply
+    manager._save_history()
+
+
+def test_assistant_resumes_unless_told_to_start_over(tmp_path):
+    history = tmp_path / ".whittle" / "chat.jsonl"
+    history.parent.mkdir()
+    history.write_text(json.dumps({"role": "user", "content": "q1"}) + "\n")
+    console = Console(file=io.StringIO())
+
+    assert AIAssistant(tmp_path, "sk-test", console).conversation_manager.has_history
+    fresh = AIAssistant(tmp_path, "sk-test", console, resume=False)
+    assert not fresh.conversation_manager.has_history
+    assert not history.exists()
+
+
+def test_assistant_uses_the_given_history_path(tmp_path):
+    history = tmp_path / "elsewhere.jsonl"
+    history.write_text(json.dumps({"role": "user", "content": "q1"}) + "\n")
+    assistant = AIAssistant(
+        tmp_path, "sk-test", Console(file=io.StringIO()), history_path=history
+    )
+
+    assert assistant.history_path == history
+    assert assistant.conversation_manager.messages[-1]["content"] == "q1"
@@ -0,0 +1,102 @@
+import json
+import os
+import time
+
+from whittle.mesh.ai_assistant import LLMResponseCache
+
+MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+
+
+def _age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_make_key_depends_on_the_whole_request():
+    key = LLMResponseCache.make_key("model", MESSAGES, 0)
+
+    assert key == LLMResponseCache.make_key("model", [dict(m) for m in MESSAGES], 0)
+    assert key != LLMResponseCache.make_key("other", MESSAGES, 0)
+    assert key != LLMResponseCache.make_key("model", MESSAGES, 0.7)
+    assert key != LLMResponseCache.make_key("model", MESSAGES[:1], 0)
+
+
+def test_only_deterministic_requests_are_cacheable(monkeypatch):
+    monkeypatch.delenv("WHITTLE_CACHE_FORCE", raising=False)
+    assert LLMResponseCache.is_cacheable(0)
+    assert not LLMResponseCache.is_cacheable(0.7)
+
+    monkeypatch.setenv("WHITTLE_CACHE_FORCE", "1")
+    assert LLMResponseCache.is_cacheable(0.7)
+
+
+def test_entries_persist_across_instances(tmp_path):
+    LLMResponseCache(cache_dir=tmp_path).set("key", "reply")
+    cache = LLMResponseCache(cache_dir=tmp_path)
+
+    assert cache.get("key") == "reply"
+    assert cache.get("key") == "reply"
+    assert cache.stats == {"hits": 2, "misses": 0}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_missing_and_corrupt_entries_are_misses(tmp_path):
+    (tmp_path / "corrupt.json").write_text("{not json")
+    (tmp_path / "wrong.json").write_text(json.dumps({"other": 1}))
+    cache = LLMResponseCache(cache_dir=tmp_path)
+
+    assert cache.get("absent") is None
+    assert cache.get("corrupt") is None
+    assert cache.get("wrong") is None
+    assert cache.stats == {"hits": 0, "misses": 3}
+
+
+def test_entry_that_expires_during_a_session_is_a_miss_and_removed(tmp_path):
+    reader = LLMResponseCache(cache_dir=tmp_path, ttl=60)
+    LLMResponseCache(cache_dir=tmp_path, ttl=60).set("key", "reply")
+    _age(tmp_path / "key.json", 120)
+
+    assert reader.get("key") is None
+    assert reader.stats == {"hits": 0, "misses": 1}
+    assert not (tmp_path / "key.json").exists()
+
+
+def test_expired_entries_are_swept_when_the_cache_is_created(tmp_path):
+    old = LLMResponseCache(cache_dir=tmp_path, ttl=60)
+    for key in ("a", "b", "c"):
+        old.set(key, "reply")
+        _age(tmp_path / f"{key}.json", 120)
+    stray = tmp_path / "left-over.tmp"
+    stray.write_text("")
+    _age(stray, 120)
+    unrelated = tmp_path / "notes.txt"
+    unrelated.write_text("")
+    _age(unrelated, 120)
+
+    new = LLMResponseCache(cache_dir=tmp_path, ttl=60)
+    new.set("d", "reply")
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["d.json", "notes.txt"]
+
+
+def test_no_ttl_keeps_old_entries(tmp_path):
+    LLMResponseCache(cache_dir=tmp_path, ttl=None).set("key", "reply")
+    _age(tmp_path / "key.json", 10 * 365 * 24 * 3600)
+
+    assert LLMResponseCache(cache_dir=tmp_path, ttl=None).get("key") == "reply"
+
+
+def test_missing_cache_dir_is_created_on_first_write(tmp_path):
+    cache = LLMResponseCache(cache_dir=tmp_path / "a" / "b")
+    cache.set("key", "reply")
+
+    assert json.loads((tmp_path / "a" / "b" / "key.json").read_text()) == {"response": "reply"}
+
+
+def test_unwritable_cache_dir_keeps_the_entry_in_memory(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    cache = LLMResponseCache(cache_dir=blocker / "cache")
+    cache.set("key", "reply")
+
+    assert cache.get("key") == "reply"
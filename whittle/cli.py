@@ -4,11 +4,8 @@ Command Line Interface for Whittle
 import typer
 from pathlib import Path
 from rich.console import Console
-from rich.panel import Panel
 from typing import Optional
-import os
 
-from whittle.mesh.ai_assistant import AIAssistant
 from whittle.config import load_config, get_openai_key
 
 app = typer.Typer(
@@ -34,6 +31,26 @@ def main(
         help="OpenAI API key. Can also be set via OPENAI_API_KEY environment variable or .env file.",
         envvar="OPENAI_API_KEY",
     ),
+    model: Optional[str] = typer.Option(
+        None,
+        "--model",
+        "-m",
+        help="OpenAI model to use (default: gpt-4o-mini). "
+        "Can also be set via WHITTLE_OPENAI_MODEL.",
+        envvar="WHITTLE_OPENAI_MODEL",
+    ),
+    new: bool = typer.Option(
+        False,
+        "--new",
+        help="Start a new conversation instead of resuming the one saved for this case.",
+    ),
+    history: Optional[Path] = typer.Option(
+        None,
+        "--history",
+        help="File the conversation is saved to and resumed from "
+        "(default: CASE_DIR/.whittle/chat.jsonl).",
+        dir_okay=False,
+    ),
 ):
     """Interactive AI-powered mesh generation assistant"""
     try:
@@ -44,20 +61,27 @@ def main(
         api_key = api_key or get_openai_key()
         
         if not api_key:
-            console.print("[red]Error: OpenAI API key not found.[/red]")
-            console.print("Please provide it using one of these methods:")
-            console.print("1. --api-key command line option")
-            console.print("2. OPENAI_API_KEY environment variable")
-            console.print("3. .env file in current directory")
-            console.print("4. .env file in home directory")
+            console.print(
+                "[red]Error: OpenAI API key not found.[/red]\n"
+                "Please provide it using one of these methods:\n"
+                "1. --api-key command line option\n"
+                "2. OPENAI_API_KEY environment variable\n"
+                "3. .env file in current directory\n"
+                "4. .env file in home directory"
+            )
             raise typer.Exit(1)
             
-        # Set environment variable for other parts of the code
-        os.environ["OPENAI_API_KEY"] = api_key
-        
+        # Imported here so --help and argument errors don't pay for openai
+        from whittle.mesh.ai_assistant import AIAssistant
+
         # Create and run the assistant with the API key
-        assistant = AIAssistant(case_dir, api_key, console)
+        assistant = AIAssistant(
+            case_dir, api_key, console, model=model, history_path=history, resume=not new
+        )
         assistant.run()
+    except typer.Exit:
+        # Deliberate exits have already reported their own error
+        raise
     except Exception as e:
         console.print(f"[red]Error:[/red] {str(e)}")
         raise typer.Exit(1)
@@ -2,9 +2,8 @@
 Configuration management for Whittle
 """
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import os
-from dotenv import load_dotenv
 
 def load_config() -> None:
     """
@@ -14,13 +13,21 @@ def load_config() -> None:
     2. .env file in current directory
     3. .env file in user's home directory
     """
-    # Try loading from current directory first
-    load_dotenv(Path(".env"))
-    
-    # Then try user's home directory
-    home_env = Path.home() / ".env"
-    if home_env.exists():
-        load_dotenv(home_env)
+    # Lowest priority first so later files override earlier ones
+    env_files = [p for p in (Path.home() / ".env", Path(".env")) if p.is_file()]
+    if not env_files:
+        return
+
+    from dotenv import dotenv_values
+
+    # Parse both files once, then merge into the environment in a single pass
+    merged: Dict[str, Optional[str]] = {}
+    for env_file in env_files:
+        merged.update(dotenv_values(env_file))
+
+    for key, value in merged.items():
+        if value is not None:
+            os.environ.setdefault(key, value)
         
 def get_openai_key() -> Optional[str]:
     """Get OpenAI API key from environment"""
@@ -2,16 +2,20 @@
 AI-powered OpenFOAM case setup and mesh generation assistant
 """
 from pathlib import Path
-from typing import Optional, Dict, List, Protocol
+from typing import Callable, Optional, Dict, List, Protocol, Tuple
 from enum import Enum, auto
 import re
+import os
+import json
+import hashlib
+import tempfile
+import time
+from functools import lru_cache
 from dataclasses import dataclass
 from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-import openai
+from rich.text import Text
 import subprocess
-from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 class DictionaryType(Enum):
     SYSTEM = auto()
@@ -52,10 +56,11 @@ class IDictionaryExtractor(Protocol):
 class IDictionaryWriter(Protocol):
     """Writes dictionary files to the appropriate locations"""
     def write_dictionary(self, name: str, content: str, dict_type: DictionaryType) -> None: pass
+    def write_dictionaries(self, entries: List[Tuple[str, str, DictionaryType]]) -> None: pass
 
-class DefaultPromptManager(IPromptManager):
-    def __init__(self):
-        self._system_prompt = """You are an expert in OpenFOAM mesh generation and case setup. Your task is to help users create appropriate mesh configurations and solver settings for their CFD cases.
+# Kept as module constants so every conversation starts with byte-identical
+# messages, which lets OpenAI's automatic prompt caching reuse the prefix
+SYSTEM_PROMPT = """You are an expert in OpenFOAM mesh generation and case setup. Your task is to help users create appropriate mesh configurations and solver settings for their CFD cases.
 You should:
 1. Understand the user's geometry and simulation requirements
 2. Recommend the best meshing approach (blockMesh, snappyHexMesh, etc.)
@@ -90,7 +95,8 @@ For initial conditions, create all necessary field files in the 0/ directory wit
 - Appropriate boundary conditions for each patch
 - Initial field values
 - Dimensions and units"""
-        self._initial_prompt = """I need help creating a mesh and setting up the case for OpenFOAM. 
+
+INITIAL_PROMPT = """I need help creating a mesh and setting up the case for OpenFOAM. 
 To provide the best recommendations, please tell me about:
 
 1. The geometry and its characteristics
@@ -122,6 +128,19 @@ This information will help me generate appropriate:
 - Solver settings (fvSolution)
 - Initial conditions
 """
+
+HISTORY_SUMMARY_PROMPT = (
+    "Summarize the following part of a conversation about setting up an OpenFOAM case.\n"
+    "Keep every decision and requirement that was agreed: geometry, physics models, "
+    "mesh approach and resolution, time settings, boundary and initial conditions, "
+    "and which dictionary files were already provided. Leave out the full dictionary "
+    "contents and general explanations. Be concise."
+)
+
+class DefaultPromptManager(IPromptManager):
+    def __init__(self):
+        self._system_prompt = SYSTEM_PROMPT
+        self._initial_prompt = INITIAL_PROMPT
     
     def get_system_prompt(self) -> str:
         return self._system_prompt
@@ -138,6 +157,8 @@ class OpenFOAMFilePathManager(IFilePathManager):
         self.system_dir = case_dir / "system"
         self.constant_dir = case_dir / "constant"
         self.zero_dir = case_dir / "0"
+        # Leaf directories only; constant/ is created as triSurface's parent
+        self._case_dirs = (self.system_dir, self.zero_dir, self.constant_dir / "triSurface")
     
     def get_system_dir(self) -> Path:
         return self.system_dir
@@ -149,50 +170,68 @@ class OpenFOAMFilePathManager(IFilePathManager):
         return self.zero_dir
     
     def ensure_directories_exist(self) -> None:
-        self.system_dir.mkdir(parents=True, exist_ok=True)
-        self.constant_dir.mkdir(parents=True, exist_ok=True)
-        self.zero_dir.mkdir(exist_ok=True)
-        (self.constant_dir / "triSurface").mkdir(exist_ok=True)
+        # A single stat covers the usual case where the directories already exist;
+        # mkdir(exist_ok=True) would issue a failing mkdir plus a stat for each
+        for directory in self._case_dirs:
+            if not directory.is_dir():
+                directory.mkdir(parents=True, exist_ok=True)
+
+# Dictionaries that belong in system/ and 0/; anything else goes to constant/
+SYSTEM_FILES = frozenset({
+    "blockMeshDict", "snappyHexMeshDict", "controlDict",
+    "fvSchemes", "fvSolution"
+})
+INITIAL_CONDITION_FILES = frozenset({
+    "U", "p", "k", "epsilon", "omega", "nut", "alpha.water", "alpha.air"
+})
+# Each known name resolved to its type up front, so classifying is a single lookup
+_DICTIONARY_TYPES: Dict[str, DictionaryType] = {
+    **dict.fromkeys(INITIAL_CONDITION_FILES, DictionaryType.INITIAL_CONDITION),
+    **dict.fromkeys(SYSTEM_FILES, DictionaryType.SYSTEM),
+}
 
 class OpenFOAMDictionaryClassifier(IDictionaryClassifier):
     def __init__(self, path_manager: IFilePathManager):
         self.path_manager = path_manager
-        self.system_files = {
-            "blockMeshDict", "snappyHexMeshDict", "controlDict",
-            "fvSchemes", "fvSolution"
-        }
-        self.initial_condition_files = {
-            "U", "p", "k", "epsilon", "omega", "nut", "alpha.water", "alpha.air"
+        self.system_files = SYSTEM_FILES
+        self.initial_condition_files = INITIAL_CONDITION_FILES
+        self._target_dirs = {
+            DictionaryType.SYSTEM: path_manager.get_system_dir(),
+            DictionaryType.CONSTANT: path_manager.get_constant_dir(),
+            DictionaryType.INITIAL_CONDITION: path_manager.get_zero_dir(),
         }
     
     def get_dictionary_type(self, dict_name: str) -> DictionaryType:
-        if dict_name in self.system_files:
-            return DictionaryType.SYSTEM
-        elif dict_name in self.initial_condition_files:
-            return DictionaryType.INITIAL_CONDITION
-        else:
-            return DictionaryType.CONSTANT
+        return _DICTIONARY_TYPES.get(dict_name, DictionaryType.CONSTANT)
     
     def get_target_directory(self, dict_type: DictionaryType) -> Path:
-        if dict_type == DictionaryType.SYSTEM:
-            return self.path_manager.get_system_dir()
-        elif dict_type == DictionaryType.INITIAL_CONDITION:
-            return self.path_manager.get_zero_dir()
-        else:
-            return self.path_manager.get_constant_dir()
+        # Anything else, including UNKNOWN, goes to constant/
+        return self._target_dirs.get(dict_type, self._target_dirs[DictionaryType.CONSTANT])
+
+_FOAM_OPEN = "```foam\n"
+_FENCE = "```"
+_OBJECT_RE = re.compile(r"object\s+(\w+);")
 
 class FoamDictionaryExtractor(IDictionaryExtractor):
     def extract_dictionaries(self, content: str) -> Dict[str, str]:
-        pattern = r"```foam\n(.*?)```"
-        matches = re.finditer(pattern, content, re.DOTALL)
-        
+        # Jump from fence to fence with str.find rather than letting a DOTALL regex
+        # walk every character; only the block bodies are searched for the object name
         dictionaries = {}
-        for match in matches:
-            content = match.group(1)
-            dict_match = re.search(r"object\s+(\w+);", content)
+        end = 0
+        while True:
+            start = content.find(_FOAM_OPEN, end)
+            if start < 0:
+                break
+            start += len(_FOAM_OPEN)
+            end = content.find(_FENCE, start)
+            if end < 0:
+                # Unterminated block, e.g. a truncated reply
+                break
+            body = content[start:end]
+            dict_match = _OBJECT_RE.search(body)
             if dict_match:
-                dict_name = dict_match.group(1)
-                dictionaries[dict_name] = content
+                dictionaries[dict_match.group(1)] = body
+            end += len(_FENCE)
         
         return dictionaries
 
@@ -202,10 +241,32 @@ class OpenFOAMDictionaryWriter(IDictionaryWriter):
         self.console = console
     
     def write_dictionary(self, name: str, content: str, dict_type: DictionaryType) -> None:
+        self.console.print(self._write(name, content, dict_type))
+    
+    def write_dictionaries(self, entries: List[Tuple[str, str, DictionaryType]]) -> None:
+        """Write several dictionaries and report them with a single console print"""
+        if not entries:
+            return
+        # The files are independent, so write them concurrently; on networked
+        # filesystems each write can take tens of milliseconds
+        with ThreadPoolExecutor(max_workers=min(8, len(entries))) as executor:
+            lines = list(executor.map(lambda entry: self._write(*entry), entries))
+        self.console.print(Text("\n").join(lines))
+    
+    def _write(self, name: str, content: str, dict_type: DictionaryType) -> Text:
         target_dir = self.classifier.get_target_directory(dict_type)
         file_path = target_dir / name
-        file_path.write_text(content)
-        self.console.print(f"[green]✓[/green] Created {name} at {file_path}")
+        data = content.encode("utf-8")
+        # Leave identical files alone so their mtime (and anything watching it) is untouched
+        try:
+            unchanged = file_path.stat().st_size == len(data) and file_path.read_bytes() == data
+        except FileNotFoundError:
+            unchanged = False
+        if unchanged:
+            return Text(f"= {name} unchanged at {file_path}", style="dim")
+        file_path.write_bytes(data)
+        # Assembled directly so rich doesn't have to parse markup for every line
+        return Text.assemble(("✓", "green"), f" Created {name} at {file_path}")
 
 class DictionaryManager:
     """Coordinates dictionary operations using the component classes"""
@@ -219,82 +280,378 @@ class DictionaryManager:
         self.classifier = classifier
         self.writer = writer
         
-        # Track required files and their status
-        self.required_files = {
-            "controlDict": False,
-            "fvSchemes": False,
-            "fvSolution": False,
-            "blockMeshDict": False,  # At least one of blockMeshDict or snappyHexMeshDict is required
-            "snappyHexMeshDict": False,
-            "U": False,  # Basic initial conditions
-            "p": False,
-        }
+        # Files every case needs, plus basic initial conditions (U, p)
+        self.required_files = frozenset({"controlDict", "fvSchemes", "fvSolution", "U", "p"})
+        # At least one of these mesh dictionaries is required
+        self.mesh_files = frozenset({"blockMeshDict", "snappyHexMeshDict"})
         self.written_files = set()
     
     def process_ai_response(self, response: str) -> None:
         """Process an AI response and write any dictionary files found"""
         dictionaries = self.extractor.extract_dictionaries(response)
-        for name, content in dictionaries.items():
-            dict_type = self.classifier.get_dictionary_type(name)
-            self.writer.write_dictionary(name, content, dict_type)
-            self.written_files.add(name)
-            if name in self.required_files:
-                self.required_files[name] = True
+        self.writer.write_dictionaries([
+            (name, content, self.classifier.get_dictionary_type(name))
+            for name, content in dictionaries.items()
+        ])
+        self.written_files.update(dictionaries)
     
     def get_missing_required_files(self) -> List[str]:
         """Get list of required files that haven't been written yet"""
-        missing = []
-        for name, written in self.required_files.items():
-            # Special handling for mesh dictionary (need either blockMesh or snappyHexMesh)
-            if name in ["blockMeshDict", "snappyHexMeshDict"]:
-                if not (self.required_files["blockMeshDict"] or self.required_files["snappyHexMeshDict"]):
-                    missing.append("blockMeshDict or snappyHexMeshDict")
-                    break
-            elif not written:
-                missing.append(name)
+        missing = sorted(self.required_files - self.written_files)
+        if self.mesh_files.isdisjoint(self.written_files):
+            missing.append("blockMeshDict or snappyHexMeshDict")
         return missing
 
-class IAIConversationManager(ABC):
-    @abstractmethod
-    def get_response(self, user_input: str) -> str: pass
-
-class ICaseStructureManager(ABC):
-    @abstractmethod
+class IAIConversationManager(Protocol):
+    """Manages the conversation with the AI model"""
+    def get_response(
+        self,
+        user_input: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        temperature: Optional[float] = None,
+    ) -> str: pass
+    def batch_get_responses(
+        self, user_inputs: List[str], temperature: Optional[float] = None
+    ) -> List[str]: pass
+    @property
+    def has_history(self) -> bool: pass
+
+class ICaseStructureManager(Protocol):
+    """Creates the OpenFOAM case directory structure"""
     def setup_case_structure(self) -> None: pass
 
-class IMeshExecutor(ABC):
-    @abstractmethod
+class IMeshExecutor(Protocol):
+    """Runs the OpenFOAM meshing utilities"""
     def run_mesh(self) -> None: pass
 
+def _atomic_write(path: Path, text: str) -> None:
+    """Best-effort write of a file that readers never see half-written
+    
+    The text goes to a temporary file beside path, which is then renamed over it.
+    Errors are swallowed: callers only use this for caches and saved state that
+    mustn't fail the turn that produced them.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        Path(tmp_path).unlink(missing_ok=True)
+
+class LLMResponseCache:
+    """
+    Caches AI replies in memory and on disk, keyed by a hash of the exact request.
+    Only deterministic requests (temperature 0) are cached unless WHITTLE_CACHE_FORCE=1.
+    Disk entries older than ttl seconds are treated as misses and removed.
+    """
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: Optional[float] = 7 * 24 * 3600):
+        self.cache_dir = cache_dir or Path.home() / ".whittle" / "llm_cache"
+        self.ttl = ttl
+        self._memory: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        if ttl is not None:
+            self._remove_expired()
+    
+    def _remove_expired(self) -> None:
+        """Delete disk entries (and stray temporary files) older than the TTL
+        
+        Keys cover whole conversations and rarely repeat, so get() alone would
+        almost never see an expired entry again to remove it.
+        """
+        cutoff = time.time() - self.ttl
+        try:
+            paths = list(self.cache_dir.iterdir())
+        except OSError:
+            return
+        for path in paths:
+            if path.suffix not in (".json", ".tmp"):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], temperature: float) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def is_cacheable(temperature: float) -> bool:
+        return temperature == 0 or os.getenv("WHITTLE_CACHE_FORCE") == "1"
+    
+    def get(self, key: str) -> Optional[str]:
+        response = self._memory.get(key)
+        if response is None:
+            path = self.cache_dir / f"{key}.json"
+            try:
+                if self.ttl is not None and time.time() - path.stat().st_mtime > self.ttl:
+                    path.unlink(missing_ok=True)
+                    raise FileNotFoundError(path)
+                response = json.loads(path.read_text(encoding="utf-8"))["response"]
+            except (OSError, ValueError, KeyError):
+                self.misses += 1
+                return None
+            self._memory[key] = response
+        self.hits += 1
+        return response
+    
+    def set(self, key: str, response: str) -> None:
+        self._memory[key] = response
+        _atomic_write(self.cache_dir / f"{key}.json", json.dumps({"response": response}))
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+# Small, fast model; the replies are mostly structured dictionary files
+DEFAULT_MODEL = "gpt-4o-mini"
+
+@lru_cache(maxsize=4)
+def _client_for(api_key: str):
+    """Share one OpenAI client, and so one connection pool, per API key"""
+    # Deferred so importing this module doesn't pay for the OpenAI SDK (~0.4 s)
+    import openai
+    return openai.Client(api_key=api_key)
+
 class OpenAIConversationManager(IAIConversationManager):
-    def __init__(self, api_key: str, system_prompt: str):
-        self.client = openai.Client(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        system_prompt: str,
+        cache: Optional[LLMResponseCache] = None,
+        max_history_tokens: int = 32000,
+        model: Optional[str] = None,
+        persist_path: Optional[Path] = None,
+        console: Optional[Console] = None,
+    ):
+        self.client = _client_for(api_key)
+        self.model = model or os.getenv("WHITTLE_OPENAI_MODEL") or DEFAULT_MODEL
+        self.temperature = 0.7
+        self.cache = cache
+        self.max_history_tokens = max_history_tokens
         self.messages: List[Dict[str, str]] = [{"role": "system", "content": system_prompt}]
+        # Everything after the system prompt is saved, one message per line, so a later
+        # run against the same case picks up where this one left off
+        self.persist_path = persist_path
+        self.console = console
+        if persist_path and persist_path.is_file():
+            self._load_history()
+        # Requests sharing a key are routed to the same prompt cache, so every
+        # session with this system prompt can reuse its cached prefix
+        prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+        self.prompt_cache_key = "whittle-" + prompt_hash[:16]
     
-    def get_response(self, user_input: str) -> str:
+    def get_response(
+        self,
+        user_input: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """Get the AI's reply, passing each streamed piece of text to on_chunk as it arrives
+        
+        temperature overrides the conversation's default for this request; 0 makes
+        the reply deterministic, and so cacheable.
+        """
         self.messages.append({"role": "user", "content": user_input})
+        ai_response = self._complete(self.messages, temperature, on_chunk)
+        self._record_reply(ai_response)
+        self._compact_history()
+        return ai_response
+    
+    @property
+    def has_history(self) -> bool:
+        """Whether there is conversation beyond the system prompt, e.g. from a previous run"""
+        return len(self.messages) > 1
+    
+    def _load_history(self) -> None:
+        try:
+            lines = self.persist_path.read_bytes().splitlines()
+        except OSError:
+            return
+        skipped = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if not isinstance(message, dict) or "role" not in message or "content" not in message:
+                skipped += 1
+                continue
+            self.messages.append(message)
+        if skipped:
+            if self.console:
+                self.console.print(
+                    f"[yellow]![/yellow] Skipped {skipped} unreadable line(s) "
+                    f"in {self.persist_path}"
+                )
+            # Usually a last line cut short by a crash mid-append; rewrite the file so
+            # the next append doesn't land on the end of the broken line
+            self._save_history()
+    
+    def _record_reply(self, ai_response: str) -> None:
+        self.messages.append({"role": "assistant", "content": ai_response})
+        if self.persist_path:
+            # Only the new question/answer pair is appended. Saving is best-effort:
+            # e.g. a read-only case directory just means the session can't be resumed.
+            try:
+                self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+                with self.persist_path.open("a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(message) + "\n" for message in self.messages[-2:])
+            except OSError:
+                pass
+    
+    def _save_history(self) -> None:
+        """Rewrite the saved conversation, e.g. after older messages were summarized"""
+        _atomic_write(
+            self.persist_path,
+            "".join(json.dumps(message) + "\n" for message in self.messages[1:]),
+        )
+    
+    def batch_get_responses(
+        self,
+        user_inputs: List[str],
+        temperature: Optional[float] = None,
+        max_workers: int = 8,
+    ) -> List[str]:
+        """Answer independent prompts concurrently, in order, without adding them to the history
+        
+        Each prompt is sent as its own follow-up to the conversation so far, so one
+        doesn't see the others' replies.
+        """
+        if not user_inputs:
+            return []
+        history = list(self.messages)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(user_inputs))) as pool:
+            return list(pool.map(
+                lambda user_input: self._complete(
+                    [*history, {"role": "user", "content": user_input}], temperature
+                ),
+                user_inputs,
+            ))
+    
+    def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Get the reply to messages from the cache, or stream it from the API and cache it"""
+        if temperature is None:
+            temperature = self.temperature
+        
+        cache_key = None
+        if self.cache and self.cache.is_cacheable(temperature):
+            cache_key = self.cache.make_key(self.model, messages, temperature)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if on_chunk:
+                    on_chunk(cached)
+                return cached
         
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=self.messages,
-            temperature=0.7,
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            # Sent via extra_body so older SDK versions without the parameter still work
+            extra_body={"prompt_cache_key": self.prompt_cache_key},
         )
         
-        ai_response = response.choices[0].message.content
-        self.messages.append({"role": "assistant", "content": ai_response})
+        # Deltas without text (role-only, tool or usage events) carry None and are skipped
+        chunks: List[str] = []
+        for event in stream:
+            if not event.choices:
+                continue
+            chunk = event.choices[0].delta.content
+            if chunk:
+                chunks.append(chunk)
+                if on_chunk:
+                    on_chunk(chunk)
+        
+        ai_response = "".join(chunks)
+        if cache_key:
+            self.cache.set(cache_key, ai_response)
         return ai_response
+    
+    @staticmethod
+    def _estimate_tokens(messages: List[Dict[str, str]]) -> int:
+        # Roughly four characters per token for English text and dictionary syntax
+        return sum(len(message["content"]) for message in messages) // 4
+    
+    def _compact_history(self) -> None:
+        """Replace the older part of the conversation with a summary once it grows too long"""
+        if self._estimate_tokens(self.messages) <= self.max_history_tokens:
+            return
+        
+        # Keep the system prompt first so its prompt cache prefix survives, and split
+        # on a user message so the recent turns stay intact question/answer pairs.
+        # Only the turns that fit in half the budget are kept, so there is room for
+        # several more before the next summary (and the next change to the prefix).
+        history = self.messages[1:]
+        target = self.max_history_tokens // 2
+        split = None
+        kept = 0
+        for i in range(len(history) - 1, -1, -1):
+            kept += self._estimate_tokens([history[i]])
+            if history[i]["role"] == "user":
+                if split is not None and kept > target:
+                    break
+                split = i
+        if split is None or split < 2:
+            # Nothing older than the latest exchange (and any previous summary) to fold in
+            return
+        older, recent = history[:split], history[split:]
+        
+        transcript = "\n\n".join(f"{m['role']}: {m['content']}" for m in older)
+        # Already loaded by _client_for; imported here to keep the module import light
+        from openai import OpenAIError
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": HISTORY_SUMMARY_PROMPT},
+                    {"role": "user", "content": transcript},
+                ],
+                temperature=0,
+            )
+        except OpenAIError as e:
+            # Compacting only saves tokens; a failed summary (rate limit, network
+            # error) mustn't lose the reply it follows. Keep the full history and
+            # try again after the next turn.
+            if self.console:
+                self.console.print(f"[yellow]![/yellow] Couldn't summarize the conversation: {e}")
+            return
+        summary = response.choices[0].message.content
+        self.messages = [
+            self.messages[0],
+            {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"},
+            *recent,
+        ]
+        if self.persist_path:
+            self._save_history()
 
 class FileSystemCaseManager(ICaseStructureManager):
-    def __init__(self, case_dir: Path):
+    def __init__(self, case_dir: Path, path_manager: Optional[IFilePathManager] = None):
         self.case_dir = case_dir
-        self.system_dir = case_dir / "system"
-        self.constant_dir = case_dir / "constant"
+        self.path_manager = path_manager or OpenFOAMFilePathManager(case_dir)
     
     def setup_case_structure(self) -> None:
-        self.system_dir.mkdir(parents=True, exist_ok=True)
-        self.constant_dir.mkdir(parents=True, exist_ok=True)
-        (self.case_dir / "0").mkdir(exist_ok=True)
-        (self.constant_dir / "triSurface").mkdir(exist_ok=True)
+        # The path manager owns the case layout; don't keep a second copy of it here
+        self.path_manager.ensure_directories_exist()
 
 class MeshExecutor(IMeshExecutor):
     def __init__(self, case_dir: Path, console: Console):
@@ -303,8 +660,15 @@ class MeshExecutor(IMeshExecutor):
     
     def run_mesh(self) -> None:
         self.console.print("\n[green]✓[/green] Running mesh generation commands...")
-        subprocess.run(["blockMesh"], cwd=self.case_dir)
-        subprocess.run(["checkMesh"], cwd=self.case_dir)
+        # Output goes straight to the terminal as the tools produce it. checkMesh
+        # needs blockMesh's result, so they run in order and stop at the first failure.
+        for command in ("blockMesh", "checkMesh"):
+            result = subprocess.run([command], cwd=self.case_dir)
+            if result.returncode != 0:
+                self.console.print(
+                    f"\n[red]✗[/red] {command} failed with exit code {result.returncode}"
+                )
+                return
         self.console.print("\n[green]✓[/green] Mesh generation complete!")
 
 # Main class using dependency injection
@@ -318,8 +682,20 @@ class AIAssistant:
         api_key: str,
         console: Optional[Console] = None,
         prompt_manager: Optional[IPromptManager] = None,
+        model: Optional[str] = None,
+        history_path: Optional[Path] = None,
+        cache: Optional[LLMResponseCache] = None,
+        resume: bool = True,
     ):
         self.console = console or Console()
+        # Where the conversation is saved so the next run on this case can resume it
+        self.history_path = history_path or case_dir / ".whittle" / "chat.jsonl"
+        if not resume:
+            # Start over; this session's conversation replaces the saved one
+            try:
+                self.history_path.unlink(missing_ok=True)
+            except OSError:
+                pass
         
         # Initialize managers
         path_manager = OpenFOAMFilePathManager(case_dir)
@@ -330,14 +706,42 @@ class AIAssistant:
         self.prompt_manager = prompt_manager or DefaultPromptManager()
         self.conversation_manager = OpenAIConversationManager(
             api_key, 
-            self.prompt_manager.get_system_prompt()
+            self.prompt_manager.get_system_prompt(),
+            # Off unless a cache is passed in: every request's key covers the whole
+            # conversation, so an interactive session almost never repeats one
+            cache=cache,
+            model=model,
+            persist_path=self.history_path,
+            console=self.console,
         )
         self.dictionary_manager = DictionaryManager(extractor, classifier, writer)
         self.path_manager = path_manager
         self.mesh_executor = MeshExecutor(case_dir, self.console)
     
+    def _ask(self, prompt: str, temperature: Optional[float] = None) -> str:
+        """Send a prompt, render the reply as it streams in and write the dictionaries in it"""
+        from rich.live import Live
+        from rich.markdown import Markdown
+        
+        chunks: List[str] = []
+        # Live re-renders the Markdown at its own refresh rate rather than once per chunk.
+        # The preview is cropped to the terminal and cleared afterwards: redrawing a
+        # render taller than the screen would leave a copy in the scrollback every
+        # refresh, so the full reply is printed once when it is complete.
+        with Live(
+            console=self.console,
+            get_renderable=lambda: Markdown("".join(chunks)),
+            transient=True,
+        ):
+            response = self.conversation_manager.get_response(prompt, chunks.append, temperature)
+        self.console.print(Markdown(response))
+        self.dictionary_manager.process_ai_response(response)
+        return response
+    
     def run(self) -> None:
         """Main entry point for the AI mesh generation assistant"""
+        from rich.panel import Panel
+        
         self.console.print(Panel(
             "[bold blue]Welcome to Whittle AI Mesh Assistant![/bold blue]\n\n"
             "I'll help you set up your OpenFOAM case using AI-powered recommendations.",
@@ -347,17 +751,34 @@ class AIAssistant:
         # Create case structure
         self.path_manager.ensure_directories_exist()
         
-        # Get initial response
-        response = self.conversation_manager.get_response(
-            self.prompt_manager.get_initial_prompt()
-        )
-        self.console.print(Markdown(response))
-        self.dictionary_manager.process_ai_response(response)
+        if self.conversation_manager.has_history:
+            self.console.print(
+                f"[dim]Resuming the previous conversation saved in {self.history_path} "
+                "(run with --new to start over)[/dim]"
+            )
+            # Dictionaries from the previous run are already on disk
+            for directory in (
+                self.path_manager.get_system_dir(),
+                self.path_manager.get_constant_dir(),
+                self.path_manager.get_zero_dir(),
+            ):
+                self.dictionary_manager.written_files.update(
+                    path.name for path in directory.iterdir() if path.is_file()
+                )
+        else:
+            # Get initial response
+            self._ask(self.prompt_manager.get_initial_prompt())
         
         # Continue conversation until mesh is set up
         while True:
-            user_input = input("\nYour response ('done' to finish, 'run' to run the mesh): ")
-            
+            user_input = input(
+                "\nYour response ('done' to finish, 'run' to run the mesh): "
+            ).strip()
+
+            # Nothing to ask the AI about; don't spend a request on it
+            if not user_input:
+                continue
+
             if user_input.lower() == 'done' or user_input.lower() == 'run':
                 # Check for missing required files
                 missing_files = self.dictionary_manager.get_missing_required_files()
@@ -368,16 +789,15 @@ class AIAssistant:
 
 For each file, provide the complete dictionary content in ```foam code blocks."""
                     
-                    response = self.conversation_manager.get_response(missing_files_prompt)
-                    self.console.print(Markdown(response))
-                    self.dictionary_manager.process_ai_response(response)
+                    self._ask(missing_files_prompt)
                     
                     # Recheck for missing files
                     missing_files = self.dictionary_manager.get_missing_required_files()
                     if missing_files:
-                        self.console.print("\n[red]Still missing required files:[/red]")
-                        for file in missing_files:
-                            self.console.print(f"- {file}")
+                        self.console.print(
+                            "\n[red]Still missing required files:[/red]\n"
+                            + "\n".join(f"- {file}" for file in missing_files)
+                        )
                         continue
                 
                 if user_input.lower() == 'run':
@@ -385,12 +805,12 @@ For each file, provide the complete dictionary content in ```foam code blocks.""
                 break
             
             # Get AI response for user input
-            response = self.conversation_manager.get_response(user_input)
-            self.console.print(Markdown(response))
-            self.dictionary_manager.process_ai_response(response)
+            self._ask(user_input)
         
-        self.console.print("\n[green]✓[/green] Case setup complete!")
-        self.console.print("\nNext steps:")
-        self.console.print("1. Review the generated dictionary files")
-        self.console.print("2. Run the mesh generation commands")
-        self.console.print("3. Check the mesh quality") 
\ No newline at end of file
+        self.console.print(
+            "\n[green]✓[/green] Case setup complete!\n"
+            "\nNext steps:\n"
+            "1. Review the generated dictionary files\n"
+            "2. Run the mesh generation commands\n"
+            "3. Check the mesh quality"
+        ) 
\ No newline at end of file